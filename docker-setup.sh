@@ -55,7 +55,7 @@ cd "$WORK_DIR"
 echo ""
 echo "Copying FreeRide skill..."
 mkdir -p skills/free-ride
-cp -r "$SCRIPT_DIR"/*.py "$SCRIPT_DIR"/*.json "$SCRIPT_DIR"/*.md "$SCRIPT_DIR"/setup.py skills/free-ride/ 2>/dev/null || true
+cp -r "$SCRIPT_DIR"/*.py "$SCRIPT_DIR"/*.json "$SCRIPT_DIR"/*.md "$SCRIPT_DIR"/pyproject.toml "$SCRIPT_DIR"/freeride skills/free-ride/ 2>/dev/null || true
 
 # Create a custom Dockerfile that includes FreeRide
 echo ""
@@ -0,0 +1,6 @@
+"""
+FreeRide - Free AI for OpenClaw.
+
+Package entry point so an installed FreeRide can be run with
+``python -m freeride``; the CLI itself lives in the top-level main module.
+"""
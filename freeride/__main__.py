@@ -0,0 +1,5 @@
+"""Run the FreeRide CLI via ``python -m freeride``."""
+
+from main import main
+
+main()
@@ -6,114 +6,215 @@ for unlimited free AI access.
 """
 
 import argparse
+import heapq
 import json
 import os
 import re
+import shutil
 import sys
 import time
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from datetime import datetime
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Callable, Iterable, Tuple
 
 try:
-    import requests
-except ImportError:
-    print("Error: requests library required. Install with: pip install requests")
-    sys.exit(1)
+    import orjson
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
 except ImportError:
-    pass
+    _json_loads = json.loads
 
-from profiles import PROFILES, DEFAULT_PROFILE, VALID_PROFILES, get_profile
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+from profiles import PROFILES, DEFAULT_PROFILE, VALID_PROFILES, VALID_PROFILES_SET, Profile, get_profile
 
 
 # Constants
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/models"
 OPENCLAW_CONFIG_PATH = Path.home() / ".openclaw" / "openclaw.json"
 CACHE_FILE = Path.home() / ".openclaw" / ".freeride-cache.json"
+DERIVED_CACHE_FILE = Path.home() / ".openclaw" / ".freeride-derived.json"
 BENCHMARKS_FILE = Path(__file__).parent / "benchmarks.json"
 CACHE_DURATION_HOURS = 6
 
-# Tier scores for benchmark-based ranking
-TIER_SCORES = {"S": 1.0, "A": 0.8, "B": 0.6, "C": 0.4, "unknown": 0.3}
+# Rendered top-level help, reused until the code that renders it changes
+HELP_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "freeride"
+HELP_SOURCES = (Path(__file__), Path(__file__).with_name("profiles.py"), Path(argparse.__file__))
 
+# Bump when parse_model_metadata or tier/router classification changes
+DERIVED_CACHE_VERSION = 2
 
-def load_benchmarks() -> Dict[str, Any]:
-    """Load benchmark data from benchmarks.json."""
-    if not BENCHMARKS_FILE.exists():
-        return {}
+# Tier scores for benchmark-based ranking (every tier _tier_for can return)
+TIER_SCORES = MappingProxyType({"S": 1.0, "A": 0.8, "B": 0.6, "C": 0.4, "unknown": 0.3})
+
+# Model size in the ID or name (e.g., "70b", "235b", "8b")
+_SIZE_RE = re.compile(r"(\d+)b")
+
+# Name hints for reasoning/thinking and coding models
+_REASONING_RE = re.compile(r"thinking|r1|reasoning")
+_CODING_RE = re.compile(r"coder|code")
+
+
+class _Benchmarks(dict):
+    """Benchmark data as loaded from disk, with its compiled pattern matchers."""
+    matchers: Dict[str, Any]
+
+
+@lru_cache(maxsize=4)
+def _load_benchmarks_cached(path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a benchmarks file and compile its patterns; cached per path and modification time."""
     try:
-        return json.loads(BENCHMARKS_FILE.read_text())
+        benchmarks = _Benchmarks(_json_loads(Path(path).read_bytes()))
     except (json.JSONDecodeError, IOError):
+        benchmarks = _Benchmarks()
+
+    # Compile the pattern matchers as part of loading, so they live as long
+    # as this cache entry
+    benchmarks.matchers = _build_matchers(benchmarks)
+    return benchmarks
+
+
+def load_benchmarks(path: Path = BENCHMARKS_FILE) -> Dict[str, Any]:
+    """Load benchmark data from benchmarks.json (or another benchmarks file).
+
+    The parsed data is cached until the file changes on disk, so callers
+    share one dict and must not mutate it.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
         return {}
+    return _load_benchmarks_cached(str(path), mtime)
+
+
+def _alternation(patterns: list) -> str:
+    """Regex source matching any of the given substrings (lowercased)."""
+    return "|".join(re.escape(p.lower()) for p in patterns)
+
+
+def _compile_patterns(patterns: list) -> Optional["re.Pattern"]:
+    """Compile substring patterns into a single lowercased alternation.
+
+    The regex itself is case-sensitive; callers search lowercased model IDs.
+    """
+    if not patterns:
+        return None
+    return re.compile(_alternation(patterns))
+
+
+def _compile_tier_union(tiers: Dict) -> Optional["re.Pattern"]:
+    """Compile every tier's patterns into one regex that names the best tier.
+
+    Each tier is a lookahead branch ending in an empty group named after the
+    tier, tried in S -> C order at the start of the ID, so a single
+    ``match()`` call returns the highest matching tier as ``lastgroup``.
+    """
+    branches = []
+    for tier_name in ["S", "A", "B", "C"]:
+        patterns = tiers.get(tier_name, {}).get("patterns", [])
+        if patterns:
+            branches.append(f"(?=.*?(?:{_alternation(patterns)}))(?P<{tier_name}>)")
+    if not branches:
+        return None
+    return re.compile("|".join(branches), re.DOTALL)
+
+
+def _build_matchers(benchmarks: Dict) -> Dict[str, Any]:
+    """Precompile all benchmark pattern tables into regex matchers."""
+    tiers = benchmarks.get("tiers", {})
+    boosts = benchmarks.get("category_boosts", {})
+    return {
+        "tier_re": _compile_tier_union(tiers),
+        "router_re": _compile_patterns(benchmarks.get("routers", {}).get("patterns", [])),
+        "category_re": {
+            category: _compile_patterns(data.get("patterns", []))
+            for category, data in boosts.items()
+        },
+    }
+
+
+def _get_matchers(benchmarks: Dict) -> Dict[str, Any]:
+    """Return compiled matchers for a benchmarks dict.
+
+    Data from load_benchmarks carries the matchers compiled when its file
+    was loaded; any other dict is compiled on each call.
+    """
+    matchers = getattr(benchmarks, "matchers", None)
+    return matchers if matchers is not None else _build_matchers(benchmarks)
+
+
+def _tier_for(model_lower: str, matchers: Dict) -> str:
+    """Get the benchmark tier for an already-lowercased model ID."""
+    tier_re = matchers["tier_re"]
+    match = tier_re and tier_re.match(model_lower)
+    return match.lastgroup if match else "unknown"
+
+
+def classify(model_lower: str, matchers: Dict) -> Dict[str, Any]:
+    """Classify a lowercased model ID against every benchmark pattern table.
+
+    Returns its tier, whether it is a router, and the category boosts whose
+    patterns it matches.
+    """
+    router_re = matchers["router_re"]
+    return {
+        "tier": _tier_for(model_lower, matchers),
+        "is_router": bool(router_re and router_re.search(model_lower)),
+        "categories": [
+            category for category, category_re in matchers["category_re"].items()
+            if category_re and category_re.search(model_lower)
+        ]
+    }
 
 
 def get_benchmark_tier(model_id: str, benchmarks: Dict = None) -> str:
     """Get the benchmark tier (S/A/B/C) for a model."""
     if benchmarks is None:
         benchmarks = load_benchmarks()
-    
-    tiers = benchmarks.get("tiers", {})
-    model_lower = model_id.lower()
-    
-    for tier_name in ["S", "A", "B", "C"]:
-        tier_data = tiers.get(tier_name, {})
-        patterns = tier_data.get("patterns", [])
-        for pattern in patterns:
-            if pattern.lower() in model_lower:
-                return tier_name
-    
-    return "unknown"
+    return _tier_for(model_id.lower(), _get_matchers(benchmarks))
 
 
 def get_benchmark_score(model_id: str, benchmarks: Dict = None) -> float:
     """Get a normalized benchmark score (0-1) for a model."""
     tier = get_benchmark_tier(model_id, benchmarks)
-    return TIER_SCORES.get(tier, 0.3)
+    return TIER_SCORES[tier]
 
 
 def matches_category_boost(model_id: str, category: str, benchmarks: Dict = None) -> bool:
     """Check if a model matches a category boost pattern."""
     if benchmarks is None:
         benchmarks = load_benchmarks()
-    
-    boosts = benchmarks.get("category_boosts", {})
-    category_data = boosts.get(category, {})
-    patterns = category_data.get("patterns", [])
-    
-    model_lower = model_id.lower()
-    for pattern in patterns:
-        if pattern.lower() in model_lower:
-            return True
-    return False
+    category_re = _get_matchers(benchmarks)["category_re"].get(category)
+    return bool(category_re and category_re.search(model_id.lower()))
 
 
 def is_router_model(model_id: str, benchmarks: Dict = None) -> bool:
     """Check if a model is a router/meta-model (not a real model)."""
     if benchmarks is None:
         benchmarks = load_benchmarks()
-    
-    routers = benchmarks.get("routers", {})
-    patterns = routers.get("patterns", [])
-    
-    model_lower = model_id.lower()
-    for pattern in patterns:
-        if pattern.lower() in model_lower:
-            return True
-    return False
+    router_re = _get_matchers(benchmarks)["router_re"]
+    return bool(router_re and router_re.search(model_id.lower()))
 
 
-def parse_model_metadata(model: dict) -> Dict[str, Any]:
-    """Extract metadata from model data for scoring."""
+def parse_model_metadata(model: dict, model_lower: str = None) -> Dict[str, Any]:
+    """Extract metadata from model data for scoring.
+
+    ``model_lower`` may be passed by callers that already lowercased the ID.
+    """
     model_id = model.get("id", "")
     name = model.get("name", "")
     architecture = model.get("architecture", {})
+    if model_lower is None:
+        model_lower = model_id.lower()
     
-    # Parse model size from name (e.g., "70b", "235b", "8b")
-    size_match = re.search(r"(\d+)b", model_id.lower() + name.lower())
+    # Parse model size from ID, then name (e.g., "70b", "235b", "8b")
+    size_match = _SIZE_RE.search(model_lower) or _SIZE_RE.search(name.lower())
     size_billions = int(size_match.group(1)) if size_match else 0
     
     # Normalize size score (0-1, with 70B+ being max)
@@ -128,13 +229,13 @@ def parse_model_metadata(model: dict) -> Dict[str, Any]:
     is_vision_capable = "image" in input_modalities
     
     # Check for reasoning/thinking models
-    is_reasoning_model = any(x in model_id.lower() for x in ["thinking", "r1", "reasoning"])
+    is_reasoning_model = bool(_REASONING_RE.search(model_lower))
     
     # Check for coding models
-    is_coding_model = any(x in model_id.lower() for x in ["coder", "code"])
+    is_coding_model = bool(_CODING_RE.search(model_lower))
     
     # Check tool support
-    supported_params = model.get("supported_parameters", []) or []
+    supported_params = frozenset(model.get("supported_parameters") or ())
     has_tools = "tools" in supported_params or "tool_choice" in supported_params
     
     # Capability score based on useful features
@@ -162,8 +263,42 @@ def parse_model_metadata(model: dict) -> Dict[str, Any]:
     }
 
 
+# Heavier modules are imported on first use, so commands that never touch
+# the network (status, benchmarks, --help) don't pay for them.
+
+def _import_requests():
+    """Import requests, exiting with a hint if it isn't installed."""
+    try:
+        import requests
+    except ImportError:
+        print("Error: requests library required. Install with: pip install requests")
+        sys.exit(1)
+    return requests
+
+
+def _import_ijson():
+    """Import the optional ijson streaming parser, or return None."""
+    try:
+        import ijson
+    except ImportError:
+        return None
+    return ijson
+
+
+@lru_cache(maxsize=1)
+def _load_dotenv():
+    """Load a .env file into the environment once, if python-dotenv is installed."""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
+
+
 def get_api_key() -> Optional[str]:
     """Get OpenRouter API key from environment or OpenClaw config."""
+    _load_dotenv()
+
     # Try environment first
     api_key = os.environ.get("OPENROUTER_API_KEY")
     if api_key:
@@ -172,7 +307,7 @@ def get_api_key() -> Optional[str]:
     # Try OpenClaw config
     if OPENCLAW_CONFIG_PATH.exists():
         try:
-            config = json.loads(OPENCLAW_CONFIG_PATH.read_text())
+            config = _json_loads(OPENCLAW_CONFIG_PATH.read_bytes())
             # Check env section
             api_key = config.get("env", {}).get("OPENROUTER_API_KEY")
             if api_key:
@@ -183,26 +318,68 @@ def get_api_key() -> Optional[str]:
     return None
 
 
-def fetch_all_models(api_key: str) -> list:
-    """Fetch all models from OpenRouter API."""
-    headers = {
+def _openrouter_headers(api_key: str) -> dict:
+    """Build request headers for the OpenRouter API."""
+    return {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json"
     }
 
+
+def fetch_free_models(api_key: str, cache: Optional[dict] = None) -> Tuple[list, dict]:
+    """Fetch only the free models from OpenRouter API.
+
+    If ``cache`` (the previous models cache) carries ETag/Last-Modified
+    validators, the request is made conditional and an HTTP 304 returns the
+    cached models without downloading the catalog again.
+
+    When ijson is installed the response is stream-parsed and filtered in
+    one pass, so the full model catalog is never held in memory at once.
+
+    Returns the free models and the validators to store alongside them.
+    """
+    requests = _import_requests()
+    ijson = _import_ijson()
+    headers = _openrouter_headers(api_key)
+    parse_errors = (ijson.JSONError,) if ijson else ()
+    # Reading response.raw directly raises urllib3 errors (dropped
+    # connection, read timeout) that requests doesn't wrap for us
+    from urllib3.exceptions import HTTPError as StreamError
+    if cache:
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+
     try:
-        response = requests.get(OPENROUTER_API_URL, headers=headers, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("data", [])
-    except requests.RequestException as e:
+        with requests.get(OPENROUTER_API_URL, headers=headers, timeout=30, stream=True) as response:
+            if response.status_code == 304 and cache:
+                validators = {"etag": cache.get("etag"), "last_modified": cache.get("last_modified")}
+                return cache.get("models", []), validators
+
+            response.raise_for_status()
+            validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified")
+            }
+
+            if ijson is None:
+                models = response.json().get("data", [])
+            else:
+                response.raw.decode_content = True
+                models = ijson.items(response.raw, "data.item", use_float=True)
+            return filter_free_models(models), validators
+    except (requests.RequestException, StreamError) as e:
         print(f"Error fetching models: {e}")
-        return []
+    except parse_errors as e:
+        print(f"Error parsing models: {e}")
+    return [], {}
 
 
-def filter_free_models(models: list) -> list:
+def filter_free_models(models: Iterable[dict]) -> list:
     """Filter models to only include free ones (pricing.prompt == 0)."""
     free_models = []
+    free_ids = set()
 
     for model in models:
         model_id = model.get("id", "")
@@ -214,12 +391,15 @@ def filter_free_models(models: list) -> list:
             try:
                 if float(prompt_cost) == 0:
                     free_models.append(model)
+                    free_ids.add(model_id)
+                    continue
             except (ValueError, TypeError):
                 pass
 
         # Also include models with :free suffix
-        if ":free" in model_id and model not in free_models:
+        if ":free" in model_id and model_id not in free_ids:
             free_models.append(model)
+            free_ids.add(model_id)
 
     return free_models
 
@@ -229,115 +409,250 @@ def calculate_model_score(model: dict, profile: str = "general", benchmarks: Dic
     if benchmarks is None:
         benchmarks = load_benchmarks()
     
-    model_id = model.get("id", "")
-    
-    # Get profile configuration
-    profile_config = get_profile(profile)
-    weights = profile_config["weights"]
-    
-    # Parse model metadata
-    metadata = parse_model_metadata(model)
+    return _score_from_metadata(
+        parse_model_metadata(model),
+        model.get("id", ""),
+        get_profile(profile),
+        benchmarks
+    )
+
+
+def _scoring_params(profile_config: Profile, benchmarks: Dict) -> tuple:
+    """Resolve a profile's weights and boost settings into a flat tuple.
+
+    Computed once per ranking pass so the per-model scorer does no lookups
+    on the profile or benchmarks.
+    """
+    category_boost = profile_config.category_boost
+    boost_value = 1.0
+    if category_boost:
+        boost_value = benchmarks.get("category_boosts", {}).get(category_boost, {}).get("boost", 1.0)
+    return (
+        profile_config.weights,
+        category_boost,
+        boost_value,
+        profile_config.prefer_tools,
+        profile_config.require_vision,
+        profile_config.min_context
+    )
+
+
+def _score_from_metadata(
+    metadata: Dict[str, Any],
+    model_id: str,
+    profile_config: Profile,
+    benchmarks: Dict,
+    params: tuple = None,
+    classification: Dict[str, Any] = None
+) -> float:
+    """Score a model from its already-parsed metadata.
+
+    ``params`` is the result of ``_scoring_params`` for ``profile_config``;
+    pass it when scoring many models against the same profile.
+    ``classification`` is the model's ``classify`` result; when given, no
+    benchmark patterns are matched here.
+    """
+    if params is None:
+        params = _scoring_params(profile_config, benchmarks)
+    weights, category_boost, boost_value, prefer_tools, require_vision, min_context = params
+    w_benchmark, w_size, w_context, w_capability = weights
     
     # Get benchmark score
-    benchmark_score = get_benchmark_score(model_id, benchmarks)
+    if classification is None:
+        benchmark_score = get_benchmark_score(model_id, benchmarks)
+    else:
+        benchmark_score = TIER_SCORES[classification["tier"]]
     
     # Calculate weighted score
     score = (
-        benchmark_score * weights["benchmark"] +
-        metadata["size_score"] * weights["size"] +
-        metadata["context_score"] * weights["context"] +
-        metadata["capability_score"] * weights["capability"]
+        benchmark_score * w_benchmark +
+        metadata["size_score"] * w_size +
+        metadata["context_score"] * w_context +
+        metadata["capability_score"] * w_capability
     )
     
     # Apply profile-specific boosts
-    category_boost = profile_config.get("category_boost")
     if category_boost:
-        boost_value = benchmarks.get("category_boosts", {}).get(category_boost, {}).get("boost", 1.0)
-        
         if category_boost == "coding" and metadata["is_coding_model"]:
             score *= boost_value
         elif category_boost == "reasoning" and metadata["is_reasoning_model"]:
             score *= boost_value
         elif category_boost == "vision" and metadata["is_vision_capable"]:
             score *= boost_value
+        elif classification is not None:
+            if category_boost in classification["categories"]:
+                score *= boost_value
         elif matches_category_boost(model_id, category_boost, benchmarks):
             score *= boost_value
     
     # Apply tool preference bonus
-    if profile_config.get("prefer_tools") and metadata["has_tools"]:
+    if prefer_tools and metadata["has_tools"]:
         score *= 1.05
     
     # Vision profile: heavily penalize non-vision models
-    if profile_config.get("require_vision") and not metadata["is_vision_capable"]:
+    if require_vision and not metadata["is_vision_capable"]:
         score *= 0.1
     
     # Penalize models below minimum context requirement
-    min_context = profile_config.get("min_context", 0)
     if metadata["context_length"] < min_context:
         score *= 0.8
     
     return score
 
 
-def rank_free_models(models: list, profile: str = "general") -> list:
-    """Rank free models by quality score for a given profile."""
+def derive_model_fields(model: dict, benchmarks: Dict) -> Dict[str, Any]:
+    """Compute the profile-independent fields used for ranking a model."""
+    model_lower = model.get("id", "").lower()
+    return {
+        "metadata": parse_model_metadata(model, model_lower),
+        **classify(model_lower, _get_matchers(benchmarks))
+    }
+
+
+def rank_from_derived(models: list, derived: list, profile: str = "general", top_k: Optional[int] = None) -> list:
+    """Rank models using fields precomputed by derive_model_fields.
+
+    ``derived`` must line up index-for-index with ``models``. Models are
+    scored and sorted as plain floats first; the annotated result dicts are
+    only built once the order is known. If ``top_k`` is set, only the
+    ``top_k`` best models are returned.
+    """
     benchmarks = load_benchmarks()
-    scored_models = []
+    profile_config = get_profile(profile)
+    params = _scoring_params(profile_config, benchmarks)
     
-    for model in models:
-        model_id = model.get("id", "")
-        
-        # Mark routers separately (don't exclude, but flag them)
-        is_router = is_router_model(model_id, benchmarks)
-        
-        score = calculate_model_score(model, profile, benchmarks)
-        metadata = parse_model_metadata(model)
-        
+    scores = [
+        _score_from_metadata(
+            fields["metadata"], fields["metadata"]["model_id"],
+            profile_config, benchmarks, params, fields
+        )
+        for fields in derived
+    ]
+
+    # Sort by score descending
+    if top_k is None:
+        order = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+    else:
+        order = heapq.nlargest(top_k, range(len(scores)), key=scores.__getitem__)
+
+    scored_models = []
+    for i in order:
+        fields = derived[i]
         scored_models.append({
-            **model,
-            "_score": score,
+            **models[i],
+            "_score": scores[i],
             "_profile": profile,
-            "_tier": get_benchmark_tier(model_id, benchmarks),
-            "_is_router": is_router,
-            "_metadata": metadata
+            "_tier": fields["tier"],
+            # Mark routers separately (don't exclude, but flag them)
+            "_is_router": fields["is_router"],
+            "_metadata": fields["metadata"]
         })
 
-    # Sort by score descending
-    scored_models.sort(key=lambda x: x["_score"], reverse=True)
     return scored_models
 
 
-def get_cached_models() -> Optional[list]:
-    """Get cached model list if still valid."""
+def rank_free_models(models: list, profile: str = "general", top_k: Optional[int] = None) -> list:
+    """Rank free models by quality score for a given profile.
+
+    If ``top_k`` is set, only the ``top_k`` best models are returned.
+    """
+    benchmarks = load_benchmarks()
+    derived = [derive_model_fields(model, benchmarks) for model in models]
+    return rank_from_derived(models, derived, profile, top_k)
+
+
+def _file_mtime(path: Path) -> Optional[float]:
+    """Get a file's modification time, or None if it doesn't exist."""
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _is_cache_fresh(cache_mtime: Optional[float]) -> bool:
+    """Check whether a cache file modified at ``cache_mtime`` is still valid."""
+    return cache_mtime is not None and time.time() - cache_mtime < CACHE_DURATION_HOURS * 3600
+
+
+def read_models_cache() -> Optional[dict]:
+    """Read the raw models cache file, regardless of its age."""
     if not CACHE_FILE.exists():
         return None
 
     try:
-        cache = json.loads(CACHE_FILE.read_text())
-        cached_at = datetime.fromisoformat(cache.get("cached_at", ""))
-        if datetime.now() - cached_at < timedelta(hours=CACHE_DURATION_HOURS):
-            return cache.get("models", [])
-    except (json.JSONDecodeError, ValueError):
-        pass
+        return _json_loads(CACHE_FILE.read_bytes())
+    except (json.JSONDecodeError, OSError):
+        return None
 
-    return None
 
+def get_cached_models() -> Optional[list]:
+    """Get cached model list if still valid.
+
+    Freshness is decided from the file's mtime, so a stale cache is
+    rejected without being parsed.
+    """
+    if not _is_cache_fresh(_file_mtime(CACHE_FILE)):
+        return None
+
+    cache = read_models_cache()
+    return cache.get("models", []) if cache else None
 
-def save_models_cache(models: list):
-    """Save models to cache file."""
+
+def save_models_cache(models: list, validators: Optional[dict] = None):
+    """Save models to cache file, with the HTTP validators they came with."""
     CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
     cache = {
         "cached_at": datetime.now().isoformat(),
+        "etag": None,
+        "last_modified": None,
         "models": models
     }
-    CACHE_FILE.write_text(json.dumps(cache, indent=2))
+    cache.update(validators or {})
+    CACHE_FILE.write_bytes(_json_dumps(cache))
 
 
-def get_free_models(api_key: str, force_refresh: bool = False, profile: str = "general") -> list:
-    """Get ranked free models (from cache or API).
+def get_derived_fields(models: list) -> list:
+    """Get derived ranking fields for the models in the cache file.
+
+    The derived cache is keyed on the model cache and benchmarks.json
+    modification times plus DERIVED_CACHE_VERSION, so it is rebuilt
+    whenever any of them change. Records are matched to models by
+    position, so the cached model IDs must also line up with ``models``.
+    """
+    cache_mtime = _file_mtime(CACHE_FILE)
+    key = [DERIVED_CACHE_VERSION, cache_mtime, _file_mtime(BENCHMARKS_FILE)]
+
+    if cache_mtime is not None and DERIVED_CACHE_FILE.exists():
+        try:
+            cache = _json_loads(DERIVED_CACHE_FILE.read_bytes())
+            derived = cache.get("models") if isinstance(cache, dict) else None
+            if (derived is not None and cache.get("key") == key and len(derived) == len(models)
+                    and all(record["metadata"]["model_id"] == model.get("id", "")
+                            for record, model in zip(derived, models))):
+                return derived
+        except (json.JSONDecodeError, TypeError, KeyError):
+            pass
+
+    benchmarks = load_benchmarks()
+    derived = [derive_model_fields(model, benchmarks) for model in models]
+
+    if cache_mtime is not None:
+        DERIVED_CACHE_FILE.write_bytes(_json_dumps({"key": key, "models": derived}))
+
+    return derived
+
+
+def _load_free_models(
+    api_key: str,
+    force_refresh: bool = False,
+    profile: str = "general",
+    top_k: Optional[int] = None
+) -> list:
+    """Load and rank free models (from cache or API).
     
-    Note: Cache stores raw model data. Ranking is applied fresh each time
-    based on the requested profile.
+    Note: Cache stores raw model data, plus a second cache of the
+    profile-independent fields derived from it. Ranking is applied fresh
+    each time based on the requested profile.
     """
     cached = None
     if not force_refresh:
@@ -345,16 +660,60 @@ def get_free_models(api_key: str, force_refresh: bool = False, profile: str = "g
     
     if cached:
         # Re-rank cached models with current profile
-        return rank_free_models(cached, profile)
+        return rank_from_derived(cached, get_derived_fields(cached), profile, top_k)
     
-    all_models = fetch_all_models(api_key)
-    free_models = filter_free_models(all_models)
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Load benchmarks (and compile their matchers) while the API request is in flight
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        benchmarks_future = executor.submit(load_benchmarks)
+        free_models, validators = fetch_free_models(api_key, read_models_cache())
+        benchmarks_future.result()
     
     # Cache the unranked models (so we can re-rank with different profiles)
-    save_models_cache(free_models)
+    save_models_cache(free_models, validators)
     
     # Return ranked by profile
-    return rank_free_models(free_models, profile)
+    return rank_from_derived(free_models, get_derived_fields(free_models), profile, top_k)
+
+
+@lru_cache(maxsize=8)
+def _get_free_models_cached(profile: str, cache_mtime: float, benchmarks_mtime: Optional[float]) -> Optional[list]:
+    """Fully ranked models from the cache file, memoized per cache and benchmarks mtime.
+
+    Returns None if the cache can't be read, so the caller can fetch instead.
+    """
+    cached = get_cached_models()
+    if not cached:
+        return None
+    return rank_from_derived(cached, get_derived_fields(cached), profile)
+
+
+def get_free_models(
+    api_key: str,
+    force_refresh: bool = False,
+    profile: str = "general",
+    top_k: Optional[int] = None
+) -> list:
+    """Get ranked free models (from cache or API).
+
+    Pass ``top_k`` when only the best few models are needed.
+
+    Results are memoized for the life of the process, so commands that ask
+    for the same profile more than once only rank once. The memo holds the
+    full ranking (``top_k`` slices it), is keyed on the cache file and
+    benchmarks.json mtimes and is bypassed when the cache is missing, stale
+    or a refresh is forced.
+    """
+    cache_mtime = _file_mtime(CACHE_FILE)
+    if force_refresh or not _is_cache_fresh(cache_mtime):
+        _get_free_models_cached.cache_clear()
+        return _load_free_models(api_key, force_refresh, profile, top_k)
+
+    ranked = _get_free_models_cached(profile, cache_mtime, _file_mtime(BENCHMARKS_FILE))
+    if ranked is None:
+        return _load_free_models(api_key, False, profile, top_k)
+    return ranked[:max(top_k, 0)] if top_k is not None else list(ranked)
 
 
 def load_openclaw_config() -> dict:
@@ -363,7 +722,7 @@ def load_openclaw_config() -> dict:
         return {}
 
     try:
-        return json.loads(OPENCLAW_CONFIG_PATH.read_text())
+        return _json_loads(OPENCLAW_CONFIG_PATH.read_bytes())
     except json.JSONDecodeError:
         return {}
 
@@ -371,9 +730,19 @@ def load_openclaw_config() -> dict:
 def save_openclaw_config(config: dict):
     """Save OpenClaw configuration."""
     OPENCLAW_CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    OPENCLAW_CONFIG_PATH.write_text(json.dumps(config, indent=2))
+    OPENCLAW_CONFIG_PATH.write_bytes(_json_dumps(config))
 
 
+# Model IDs whose OpenClaw form isn't just the routing prefix + ID.
+# "openrouter" is both the routing prefix AND the actual provider name of the
+# smart router: API returns "openrouter/free" -> OpenClaw needs "openrouter/openrouter/free"
+_SPECIAL_FORMATS = {
+    "openrouter/free": "openrouter/openrouter/free",
+    "openrouter/free:free": "openrouter/openrouter/free",
+}
+
+
+@lru_cache(maxsize=512)
 def format_model_for_openclaw(model_id: str) -> str:
     """Format model ID for OpenClaw config.
 
@@ -384,11 +753,9 @@ def format_model_for_openclaw(model_id: str) -> str:
     The model_id from OpenRouter API is like "qwen/qwen3-coder:free" or "openrouter/free".
     We need to prepend "openrouter/" routing prefix for OpenClaw.
     """
-    # Handle openrouter/free special case: "openrouter" is both the routing 
-    # prefix AND the actual provider name in the API model ID.
-    # API returns "openrouter/free" -> OpenClaw needs "openrouter/openrouter/free"
-    if model_id in ("openrouter/free", "openrouter/free:free"):
-        return "openrouter/openrouter/free"
+    special = _SPECIAL_FORMATS.get(model_id)
+    if special:
+        return special
     
     # If already has the openrouter/ routing prefix, return as-is
     if model_id.startswith("openrouter/"):
@@ -414,14 +781,9 @@ def get_current_fallbacks(config: dict = None) -> list:
 
 def ensure_config_structure(config: dict) -> dict:
     """Ensure the config has the required nested structure without overwriting existing values."""
-    if "agents" not in config:
-        config["agents"] = {}
-    if "defaults" not in config["agents"]:
-        config["agents"]["defaults"] = {}
-    if "model" not in config["agents"]["defaults"]:
-        config["agents"]["defaults"]["model"] = {}
-    if "models" not in config["agents"]["defaults"]:
-        config["agents"]["defaults"]["models"] = {}
+    defaults = config.setdefault("agents", {}).setdefault("defaults", {})
+    defaults.setdefault("model", {})
+    defaults.setdefault("models", {})
     return config
 
 
@@ -476,7 +838,8 @@ def update_model_config(
     if add_fallbacks:
         api_key = get_api_key()
         if api_key:
-            free_models = get_free_models(api_key)
+            # Enough candidates to cover skipping the primary and the router
+            free_models = get_free_models(api_key, top_k=fallback_count + 2)
 
             # Build new fallbacks list
             new_fallbacks = []
@@ -488,33 +851,34 @@ def update_model_config(
                 new_fallbacks.append(free_router)
                 config["agents"]["defaults"]["models"][free_router] = {}
 
+            fallback_set = set(new_fallbacks)
+
+            # The new primary, or the current one when adding to fallbacks only
+            skip_model = formatted_model if as_primary else config["agents"]["defaults"]["model"].get("primary", "")
+
             for m in free_models:
                 if len(new_fallbacks) >= fallback_count:
                     break
 
-                m_formatted = format_model_for_openclaw(m["id"])
-
                 # Skip openrouter/free (already added as first)
                 if "openrouter/free" in m["id"]:
                     continue
 
-                # Skip if it's the new primary
-                if as_primary and m_formatted == formatted_model:
-                    continue
+                m_formatted = format_model_for_openclaw(m["id"])
 
-                # Skip if it's the current primary (when adding to fallbacks only)
-                current_primary = config["agents"]["defaults"]["model"].get("primary", "")
-                if not as_primary and m_formatted == current_primary:
+                # Skip the primary and anything already listed
+                if m_formatted == skip_model or m_formatted in fallback_set:
                     continue
 
                 new_fallbacks.append(m_formatted)
+                fallback_set.add(m_formatted)
                 config["agents"]["defaults"]["models"][m_formatted] = {}
 
             # If not setting as primary, prepend new model to fallbacks (after openrouter/free)
             if not as_primary:
-                if formatted_model not in new_fallbacks:
+                if formatted_model not in fallback_set:
                     # Insert after openrouter/free if present
-                    insert_pos = 1 if free_router in new_fallbacks else 0
+                    insert_pos = 1 if free_router in fallback_set else 0
                     new_fallbacks.insert(insert_pos, formatted_model)
                 config["agents"]["defaults"]["models"][formatted_model] = {}
 
@@ -539,7 +903,7 @@ def cmd_list(args):
     profile_config = get_profile(profile)
     
     print(f"Fetching free models from OpenRouter...")
-    print(f"Profile: {profile} - {profile_config['description']}")
+    print(f"Profile: {profile} - {profile_config.description}")
     
     models = get_free_models(api_key, force_refresh=args.refresh, profile=profile)
 
@@ -555,6 +919,8 @@ def cmd_list(args):
     print(f"{'#':<3} {'Model ID':<45} {'Tier':<5} {'Context':<10} {'Score':<7} {'Status'}")
     print("-" * 95)
 
+    fallback_set = set(fallbacks)
+
     for i, model in enumerate(models[:limit], 1):
         model_id = model.get("id", "unknown")
         context = model.get("context_length", 0)
@@ -576,7 +942,7 @@ def cmd_list(args):
         status_parts = []
         if current and formatted == current:
             status_parts.append("PRIMARY")
-        elif formatted in fallbacks:
+        elif formatted in fallback_set:
             status_parts.append("FALLBACK")
         if is_router:
             status_parts.append("ROUTER")
@@ -675,7 +1041,7 @@ def cmd_auto(args):
     current_primary = get_current_model(config)
 
     print(f"Finding best free model for '{profile}' profile...")
-    print(f"  {profile_config['description']}")
+    print(f"  {profile_config.description}")
     
     models = get_free_models(api_key, force_refresh=True, profile=profile)
 
@@ -684,11 +1050,7 @@ def cmd_auto(args):
         sys.exit(1)
 
     # Find best SPECIFIC model (skip routers)
-    best_model = None
-    for m in models:
-        if not m.get("_is_router", False):
-            best_model = m
-            break
+    best_model = next((m for m in models if not m.get("_is_router", False)), None)
 
     if not best_model:
         # Fallback to first model if all are routers (unlikely)
@@ -782,14 +1144,14 @@ def cmd_status(args):
         print("Fallback Models: None configured")
 
     # Cache status
-    if CACHE_FILE.exists():
+    cache_mtime = _file_mtime(CACHE_FILE)
+    if cache_mtime is not None:
         try:
-            cache = json.loads(CACHE_FILE.read_text())
-            cached_at = datetime.fromisoformat(cache.get("cached_at", ""))
+            cache = _json_loads(CACHE_FILE.read_bytes())
             models_count = len(cache.get("models", []))
-            age = datetime.now() - cached_at
-            hours = age.seconds // 3600
-            mins = (age.seconds % 3600) // 60
+            age = int(time.time() - cache_mtime)
+            hours = age // 3600
+            mins = (age % 3600) // 60
             print(f"\nModel Cache: {models_count} models (updated {hours}h {mins}m ago)")
         except:
             print("\nModel Cache: Invalid")
@@ -832,7 +1194,8 @@ def cmd_fallbacks(args):
     print(f"Current primary: {current or 'None'}")
     print(f"Setting up {args.count} fallback models (ranked for '{profile}')...")
 
-    models = get_free_models(api_key, profile=profile)
+    # Enough candidates to cover skipping the current primary and the router
+    models = get_free_models(api_key, profile=profile, top_k=args.count + 2)
     config = ensure_config_structure(config)
 
     # Get fallbacks excluding current model
@@ -878,62 +1241,81 @@ def cmd_benchmarks(args):
         print(f"Expected at: {BENCHMARKS_FILE}")
         sys.exit(1)
     
-    print("FreeRide Benchmark Data")
-    print("=" * 60)
-    print(f"Version: {benchmarks.get('version', 'unknown')}")
-    print(f"Last updated: {benchmarks.get('last_updated', 'unknown')}")
-    print(f"Description: {benchmarks.get('description', 'N/A')}")
-    
-    print("\nQuality Tiers:")
     tiers = benchmarks.get("tiers", {})
+    boosts = benchmarks.get("category_boosts", {})
+    routers = benchmarks.get("routers", {})
+
+    lines = [
+        "FreeRide Benchmark Data",
+        "=" * 60,
+        f"Version: {benchmarks.get('version', 'unknown')}",
+        f"Last updated: {benchmarks.get('last_updated', 'unknown')}",
+        f"Description: {benchmarks.get('description', 'N/A')}",
+        "\nQuality Tiers:",
+    ]
+
     for tier_name in ["S", "A", "B", "C"]:
         tier_data = tiers.get(tier_name, {})
-        score = tier_data.get("score", "?")
         patterns = tier_data.get("patterns", [])
-        print(f"\n  Tier {tier_name} (score: {score}):")
-        print(f"    {tier_data.get('description', 'N/A')}")
+        lines.append(f"\n  Tier {tier_name} (score: {tier_data.get('score', '?')}):")
+        lines.append(f"    {tier_data.get('description', 'N/A')}")
         if patterns:
-            print(f"    Patterns: {', '.join(patterns[:5])}")
+            lines.append(f"    Patterns: {', '.join(patterns[:5])}")
             if len(patterns) > 5:
-                print(f"              ... and {len(patterns) - 5} more")
-    
-    print("\nCategory Boosts:")
-    boosts = benchmarks.get("category_boosts", {})
+                lines.append(f"              ... and {len(patterns) - 5} more")
+
+    lines.append("\nCategory Boosts:")
     for cat, data in boosts.items():
-        boost = data.get("boost", 1.0)
-        patterns = data.get("patterns", [])
-        print(f"  {cat}: {boost}x boost")
-        print(f"    Patterns: {', '.join(patterns[:3])}")
-    
-    print("\nRouters (excluded from primary selection):")
-    routers = benchmarks.get("routers", {})
-    for pattern in routers.get("patterns", []):
-        print(f"  - {pattern}")
-    
-    print(f"\nBenchmarks file: {BENCHMARKS_FILE}")
+        lines.append(f"  {cat}: {data.get('boost', 1.0)}x boost")
+        lines.append(f"    Patterns: {', '.join(data.get('patterns', [])[:3])}")
 
+    lines.append("\nRouters (excluded from primary selection):")
+    lines.extend(f"  - {pattern}" for pattern in routers.get("patterns", []))
 
-def main():
-    parser = argparse.ArgumentParser(
-        prog="freeride",
-        description="FreeRide - Free AI for OpenClaw. Manage free models from OpenRouter."
-    )
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    lines.append(f"\nBenchmarks file: {BENCHMARKS_FILE}")
+
+    # Emit the whole report in one write
+    sys.stdout.write("\n".join(lines) + "\n")
 
-    # Common profile argument helper
-    profile_help = f"Use-case profile for ranking. Options: {', '.join(VALID_PROFILES)} (default: {DEFAULT_PROFILE})"
 
-    # list command
-    list_parser = subparsers.add_parser("list", help="List available free models")
+# Subcommand name -> handler
+_DISPATCH: Dict[str, Callable] = {
+    "list": cmd_list,
+    "switch": cmd_switch,
+    "auto": cmd_auto,
+    "status": cmd_status,
+    "refresh": cmd_refresh,
+    "fallbacks": cmd_fallbacks,
+    "benchmarks": cmd_benchmarks,
+}
+
+
+# ============== Argument Parsing ==============
+
+@lru_cache(maxsize=1)
+def _profile_parent() -> argparse.ArgumentParser:
+    """Parent parser holding the --profile option shared by ranking commands."""
+    parent = argparse.ArgumentParser(add_help=False)
+    # Validated after parsing (see main) rather than through argparse choices
+    parent.add_argument("--profile", "-p", type=str, default=DEFAULT_PROFILE,
+                        help=f"Use-case profile for ranking. Options: {', '.join(VALID_PROFILES)} (default: %(default)s)")
+    return parent
+
+
+def _build_list_parser(subparsers):
+    """Add the 'list' subcommand parser."""
+    list_parser = subparsers.add_parser("list", parents=[_profile_parent()],
+                                        help="List available free models")
     list_parser.add_argument("--limit", "-n", type=int, default=15,
                             help="Number of models to show (default: 15)")
     list_parser.add_argument("--refresh", "-r", action="store_true",
                             help="Force refresh from API (ignore cache)")
-    list_parser.add_argument("--profile", "-p", type=str, default=DEFAULT_PROFILE,
-                            choices=VALID_PROFILES, help=profile_help)
 
-    # switch command
-    switch_parser = subparsers.add_parser("switch", help="Switch to a specific model")
+
+def _build_switch_parser(subparsers):
+    """Add the 'switch' subcommand parser."""
+    switch_parser = subparsers.add_parser("switch", parents=[_profile_parent()],
+                                          help="Switch to a specific model")
     switch_parser.add_argument("model", help="Model ID to switch to")
     switch_parser.add_argument("--fallback-only", "-f", action="store_true",
                               help="Add to fallbacks only, don't change primary")
@@ -941,55 +1323,152 @@ def main():
                               help="Don't configure fallback models")
     switch_parser.add_argument("--setup-auth", action="store_true",
                               help="Also set up OpenRouter auth profile")
-    switch_parser.add_argument("--profile", "-p", type=str, default=DEFAULT_PROFILE,
-                              choices=VALID_PROFILES, help=profile_help)
 
-    # auto command
-    auto_parser = subparsers.add_parser("auto", help="Auto-select best free model")
+
+def _build_auto_parser(subparsers):
+    """Add the 'auto' subcommand parser."""
+    auto_parser = subparsers.add_parser("auto", parents=[_profile_parent()],
+                                        help="Auto-select best free model")
     auto_parser.add_argument("--fallback-count", "-c", type=int, default=5,
                             help="Number of fallback models (default: 5)")
     auto_parser.add_argument("--fallback-only", "-f", action="store_true",
                             help="Add to fallbacks only, don't change primary")
     auto_parser.add_argument("--setup-auth", action="store_true",
                             help="Also set up OpenRouter auth profile")
-    auto_parser.add_argument("--profile", "-p", type=str, default=DEFAULT_PROFILE,
-                            choices=VALID_PROFILES, help=profile_help)
 
-    # status command
+
+def _build_status_parser(subparsers):
+    """Add the 'status' subcommand parser."""
     subparsers.add_parser("status", help="Show current configuration")
 
-    # refresh command
+
+def _build_refresh_parser(subparsers):
+    """Add the 'refresh' subcommand parser."""
     subparsers.add_parser("refresh", help="Refresh model cache")
 
-    # fallbacks command
-    fallbacks_parser = subparsers.add_parser("fallbacks", help="Configure fallback models")
+
+def _build_fallbacks_parser(subparsers):
+    """Add the 'fallbacks' subcommand parser."""
+    fallbacks_parser = subparsers.add_parser("fallbacks", parents=[_profile_parent()],
+                                             help="Configure fallback models")
     fallbacks_parser.add_argument("--count", "-c", type=int, default=5,
                                  help="Number of fallback models (default: 5)")
-    fallbacks_parser.add_argument("--profile", "-p", type=str, default=DEFAULT_PROFILE,
-                                 choices=VALID_PROFILES, help=profile_help)
 
-    # benchmarks command
+
+def _build_benchmarks_parser(subparsers):
+    """Add the 'benchmarks' subcommand parser."""
     subparsers.add_parser("benchmarks", help="Show benchmark data and quality tiers")
 
-    args = parser.parse_args()
 
-    if args.command == "list":
-        cmd_list(args)
-    elif args.command == "switch":
-        cmd_switch(args)
-    elif args.command == "auto":
-        cmd_auto(args)
-    elif args.command == "status":
-        cmd_status(args)
-    elif args.command == "refresh":
-        cmd_refresh(args)
-    elif args.command == "fallbacks":
-        cmd_fallbacks(args)
-    elif args.command == "benchmarks":
-        cmd_benchmarks(args)
+# Subcommand name -> function adding its subparser, in help order
+_SUBPARSER_BUILDERS = {
+    "list": _build_list_parser,
+    "switch": _build_switch_parser,
+    "auto": _build_auto_parser,
+    "status": _build_status_parser,
+    "refresh": _build_refresh_parser,
+    "fallbacks": _build_fallbacks_parser,
+    "benchmarks": _build_benchmarks_parser,
+}
+
+
+def build_parser(command: Optional[str] = None) -> Tuple[argparse.ArgumentParser, Any]:
+    """Build the CLI argument parser.
+
+    If ``command`` is a known subcommand, only its subparser is added since
+    that is all argparse needs for the invocation. Otherwise every subparser
+    is added so help and error messages list all commands.
+
+    Returns the parser and its subparsers action, whose ``choices`` maps
+    each added subcommand to its parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="freeride",
+        description="FreeRide - Free AI for OpenClaw. Manage free models from OpenRouter."
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    if command in _SUBPARSER_BUILDERS:
+        _SUBPARSER_BUILDERS[command](subparsers)
     else:
+        for build_subparser in _SUBPARSER_BUILDERS.values():
+            build_subparser(subparsers)
+
+    return parser, subparsers
+
+
+def _help_cache_file() -> Optional[Path]:
+    """Help cache file for the current output settings, or None if unknown."""
+    # argparse wraps help to the terminal width and translates it via gettext
+    columns = shutil.get_terminal_size().columns
+    python = "{}{}".format(*sys.version_info[:2])
+    lang = next((os.environ[name] for name in ("LANGUAGE", "LC_ALL", "LC_MESSAGES", "LANG")
+                 if os.environ.get(name)), "C")
+
+    # Python 3.14+ colours help on terminals, honouring NO_COLOR/FORCE_COLOR
+    colour = "plain"
+    if sys.version_info >= (3, 14):
+        try:
+            from _colorize import can_colorize
+        except ImportError:
+            return None
+        if can_colorize(file=sys.stdout):
+            colour = "colour"
+
+    key = re.sub(r"[^\w.@-]", "_", f"py{python}-{columns}-{colour}-{lang}")
+    return HELP_CACHE_DIR / f"help-{key}.txt"
+
+
+def _print_cached_help():
+    """Print the top-level help text, rendering it only when the cache is stale."""
+    help_file = _help_cache_file()
+    if help_file is None:
+        build_parser()[0].print_help()
+        return
+
+    help_mtime = _file_mtime(help_file)
+    if help_mtime is not None and all(
+        (_file_mtime(source) or 0) <= help_mtime for source in HELP_SOURCES
+    ):
+        try:
+            sys.stdout.write(help_file.read_text())
+            return
+        except OSError:
+            pass
+
+    help_text = build_parser()[0].format_help()
+    # Write then rename, so a half-written file is never taken as fresh
+    tmp_file = help_file.with_name(f"{help_file.name}.{os.getpid()}.tmp")
+    try:
+        HELP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file.write_text(help_text)
+        os.replace(tmp_file, help_file)
+    except OSError:
+        pass
+    sys.stdout.write(help_text)
+
+
+def main():
+    # Bare and top-level help invocations skip argparse entirely
+    if sys.argv[1:] in ([], ["-h"], ["--help"]):
+        _print_cached_help()
+        sys.exit(0 if sys.argv[1:] else 1)
+
+    parser, subparsers = build_parser(sys.argv[1] if len(sys.argv) > 1 else None)
+    args = parser.parse_args()
+
+    profile = getattr(args, "profile", DEFAULT_PROFILE)
+    if profile not in VALID_PROFILES_SET:
+        # Only subcommands take --profile, so report it against their usage
+        subparsers.choices[args.command].error(
+            f"argument --profile/-p: invalid choice: {profile!r} "
+            f"(choose from {', '.join(map(repr, VALID_PROFILES))})")
+
+    handler = _DISPATCH.get(args.command)
+    if handler is None:
         parser.print_help()
         sys.exit(1)
+    handler(args)
 
 
 if __name__ == "__main__":
@@ -5,78 +5,100 @@ Each profile defines weights for different scoring factors and
 specifies which category boosts to apply.
 """
 
-PROFILES = {
-    "coding": {
-        "description": "Optimized for code generation, completion, and understanding",
-        "weights": {
-            "benchmark": 0.35,
-            "size": 0.25,
-            "context": 0.25,
-            "capability": 0.15
-        },
-        "category_boost": "coding",
-        "prefer_tools": True,
-        "min_context": 32000
-    },
-    "reasoning": {
-        "description": "Optimized for complex reasoning, analysis, and problem-solving",
-        "weights": {
-            "benchmark": 0.40,
-            "size": 0.30,
-            "context": 0.20,
-            "capability": 0.10
-        },
-        "category_boost": "reasoning",
-        "prefer_tools": False,
-        "min_context": 16000
-    },
-    "general": {
-        "description": "Balanced profile for general-purpose chat and assistance",
-        "weights": {
-            "benchmark": 0.45,
-            "size": 0.25,
-            "context": 0.20,
-            "capability": 0.10
-        },
-        "category_boost": None,
-        "prefer_tools": True,
-        "min_context": 8000
-    },
-    "vision": {
-        "description": "Optimized for image understanding and multimodal tasks",
-        "weights": {
-            "benchmark": 0.30,
-            "size": 0.20,
-            "context": 0.20,
-            "capability": 0.30
-        },
-        "category_boost": "vision",
-        "prefer_tools": False,
-        "min_context": 8000,
-        "require_vision": True
-    }
-}
+from functools import lru_cache
+from types import MappingProxyType
+from typing import KeysView, Mapping, NamedTuple, Optional, Tuple
+
+
+class Profile(NamedTuple):
+    """An immutable ranking profile with flat, attribute-accessed fields."""
+    description: str
+    benchmark_w: float
+    size_w: float
+    context_w: float
+    capability_w: float
+    category_boost: Optional[str]
+    prefer_tools: bool
+    min_context: int
+    require_vision: bool = False
+
+    @property
+    def weights(self) -> Tuple[float, float, float, float]:
+        """Scoring weights as (benchmark, size, context, capability)."""
+        return (self.benchmark_w, self.size_w, self.context_w, self.capability_w)
+
+
+PROFILES: Mapping[str, Profile] = MappingProxyType({
+    "coding": Profile(
+        description="Optimized for code generation, completion, and understanding",
+        benchmark_w=0.35,
+        size_w=0.25,
+        context_w=0.25,
+        capability_w=0.15,
+        category_boost="coding",
+        prefer_tools=True,
+        min_context=32000
+    ),
+    "reasoning": Profile(
+        description="Optimized for complex reasoning, analysis, and problem-solving",
+        benchmark_w=0.40,
+        size_w=0.30,
+        context_w=0.20,
+        capability_w=0.10,
+        category_boost="reasoning",
+        prefer_tools=False,
+        min_context=16000
+    ),
+    "general": Profile(
+        description="Balanced profile for general-purpose chat and assistance",
+        benchmark_w=0.45,
+        size_w=0.25,
+        context_w=0.20,
+        capability_w=0.10,
+        category_boost=None,
+        prefer_tools=True,
+        min_context=8000
+    ),
+    "vision": Profile(
+        description="Optimized for image understanding and multimodal tasks",
+        benchmark_w=0.30,
+        size_w=0.20,
+        context_w=0.20,
+        capability_w=0.30,
+        category_boost="vision",
+        prefer_tools=False,
+        min_context=8000,
+        require_vision=True
+    )
+})
 
 DEFAULT_PROFILE = "general"
 
-VALID_PROFILES = list(PROFILES.keys())
+VALID_PROFILES = tuple(PROFILES)
+
+# Set-like view for membership checks (e.g. validating --profile): hashed
+# lookups, but iterates in definition order so usage text stays stable
+VALID_PROFILES_SET: KeysView[str] = PROFILES.keys()
 
 
-def get_profile(name: str) -> dict:
+@lru_cache(maxsize=8)
+def get_profile(name: str) -> Profile:
     """Get a profile by name, falling back to default if not found."""
     return PROFILES.get(name, PROFILES[DEFAULT_PROFILE])
 
 
-def get_profile_weights(name: str) -> dict:
-    """Get the scoring weights for a profile."""
-    return get_profile(name)["weights"]
+@lru_cache(maxsize=8)
+def get_profile_weights(name: str) -> Tuple[float, float, float, float]:
+    """Get the scoring weights for a profile as (benchmark, size, context, capability)."""
+    return get_profile(name).weights
 
 
+@lru_cache(maxsize=8)
 def get_profile_description(name: str) -> str:
     """Get the description for a profile."""
-    return get_profile(name)["description"]
+    return get_profile(name).description
 
 
-def list_profiles() -> list:
-    """Return list of all available profile names."""
-    return VALID_PROFILES.copy()
+def list_profiles() -> tuple:
+    """Return all available profile names."""
+    return VALID_PROFILES